@@ -8,6 +8,9 @@ from openai import OpenAI
 from typing import List, Dict, Optional
 import hashlib
 import json
+import re
+import traceback
+from functools import lru_cache
 
 # Pinecone import - try new API first, fallback to old
 try:
@@ -130,11 +133,21 @@ class ChatbotAgent:
         # Model configuration
         self.embedding_model = "text-embedding-ada-002"
         self.llm_model = "gpt-4-turbo-preview"  # Can use gpt-3.5-turbo for cost savings
+        self.summary_model = "gpt-3.5-turbo"  # Cheap model for condensing older conversation turns
         
         # RAG configuration
         self.max_context_chunks = 3
         self.max_response_length = 500  # Characters
-        
+
+        # Bulk ingestion configuration
+        self.embedding_batch_size = 128  # Inputs per embeddings request (API allows up to 2048)
+        self.upsert_batch_size = 100  # Vectors per Pinecone upsert (keeps requests under 2MB)
+
+        # Query embeddings are deterministic; repeated questions and the fixed sampling
+        # queries (stats, examples, FAQs) reuse them instead of calling the API again
+        self.query_embedding_cache_size = 512
+        self._cached_query_embedding = lru_cache(maxsize=self.query_embedding_cache_size)(self._get_embedding)
+
     def _get_embedding(self, text: str) -> List[float]:
         """Generate embedding for a text string"""
         response = self.client.embeddings.create(
@@ -142,7 +155,24 @@ class ChatbotAgent:
             input=text
         )
         return response.data[0].embedding
-    
+
+    def _get_embeddings(self, texts: List[str]) -> List[List[float]]:
+        """Generate embeddings for a list of texts with one API call per batch"""
+        embeddings = []
+        for start in range(0, len(texts), self.embedding_batch_size):
+            batch = texts[start:start + self.embedding_batch_size]
+            response = self.client.embeddings.create(
+                model=self.embedding_model,
+                input=batch
+            )
+            # Results carry an index; sort to keep them aligned with the inputs
+            embeddings.extend(item.embedding for item in sorted(response.data, key=lambda d: d.index))
+        return embeddings
+
+    def _get_query_embedding(self, text: str) -> List[float]:
+        """Generate embedding for a search query, reusing recent results (callers must not mutate it)"""
+        return self._cached_query_embedding(text)
+
     def _retrieve_relevant_context(self, query: str, n_results: int = None, audience: str = None) -> List[Dict]:
         """
         Retrieve relevant context from the knowledge base
@@ -159,7 +189,7 @@ class ChatbotAgent:
             n_results = self.max_context_chunks
             
         # Generate query embedding
-        query_embedding = self._get_embedding(query)
+        query_embedding = self._get_query_embedding(query)
         
         # Query Pinecone
         try:
@@ -244,7 +274,7 @@ class ChatbotAgent:
         # For better performance, use a dummy query to get results
         try:
             # Use a generic query to get documents
-            dummy_embedding = self._get_embedding("customer service email")
+            dummy_embedding = self._get_query_embedding("customer service email")
             results = self.index.query(
                 vector=dummy_embedding,
                 top_k=min(max_results * 10, 1000),  # Get more to filter
@@ -306,7 +336,7 @@ class ChatbotAgent:
         """
         try:
             # Generate embedding for search text
-            query_embedding = self._get_embedding(search_text)
+            query_embedding = self._get_query_embedding(search_text)
             
             # Query Pinecone
             results = self.index.query(
@@ -348,7 +378,7 @@ class ChatbotAgent:
         try:
             # Get a sample of documents from Pinecone
             # Use a dummy query to get documents
-            dummy_embedding = self._get_embedding("customer question")
+            dummy_embedding = self._get_query_embedding("customer question")
             results = self.index.query(
                 vector=dummy_embedding,
                 top_k=min(sample_size, 100),
@@ -425,7 +455,6 @@ Return ONLY valid JSON array, no other text."""
             try:
                 faqs = json.loads(response_text)
             except json.JSONDecodeError:
-                import re
                 json_match = re.search(r'\[.*\]', response_text, re.DOTALL)
                 if json_match:
                     faqs = json.loads(json_match.group())
@@ -441,13 +470,11 @@ Return ONLY valid JSON array, no other text."""
                 
         except Exception as e:
             print(f"Error analyzing FAQs: {e}")
-            import traceback
             traceback.print_exc()
             return []
     
     def _extract_questions_simple(self, documents: List[str]) -> List[Dict]:
         """Simple fallback method to extract questions using pattern matching"""
-        import re
         from collections import Counter
         
         question_patterns = [
@@ -540,6 +567,10 @@ Guidelines:
         
         # Add conversation history if provided
         if conversation_history:
+            # A leading system message is the summary of turns that no longer fit
+            if conversation_history[0].get('role') == 'system':
+                messages.append({"role": "system", "content": conversation_history[0].get('content', '')})
+                conversation_history = conversation_history[1:]
             for msg in conversation_history[-6:]:  # Include last 3 exchanges (6 messages)
                 messages.append({
                     "role": msg.get('role', 'user'),
@@ -574,6 +605,33 @@ Please provide a polite response suggesting they contact support directly or rep
         
         return response.choices[0].message.content.strip()
     
+    def summarize_conversation(self, messages: List[Dict], previous_summary: str = None) -> str:
+        """
+        Condense older conversation turns into a short summary
+        
+        Args:
+            messages: Conversation messages to fold into the summary (oldest first)
+            previous_summary: Summary of even earlier turns to extend (optional)
+            
+        Returns:
+            Summary string covering previous_summary and messages
+        """
+        transcript = "\n".join(f"{msg.get('role', 'user')}: {msg.get('content', '')}" for msg in messages)
+        if previous_summary:
+            transcript = f"Earlier summary: {previous_summary}\n\n{transcript}"
+        
+        response = self.client.chat.completions.create(
+            model=self.summary_model,
+            messages=[
+                {"role": "system", "content": "Summarize this customer service conversation in under 80 words. "
+                                              "Keep the customer's goal, key facts, and any unresolved questions."},
+                {"role": "user", "content": transcript}
+            ],
+            temperature=0.2,
+            max_tokens=150
+        )
+        return response.choices[0].message.content.strip()
+    
     def get_response(self, query: str, conversation_history: List[Dict] = None) -> str:
         """
         Main method to get a response for a user query
@@ -593,7 +651,6 @@ Please provide a polite response suggesting they contact support directly or rep
         is_faq_query = any(keyword in query_lower for keyword in faq_keywords)
         
         # Try to extract number (e.g., "top 5", "top 10")
-        import re
         number_match = re.search(r'\d+', query)
         num_questions = int(number_match.group()) if number_match else 10
         
@@ -718,3 +775,50 @@ Please provide a polite response suggesting they contact support directly or rep
         except Exception as e:
             print(f"Error adding document to Pinecone: {e}")
             raise
+
+    def add_documents_bulk(self, texts: List[str], metadatas: List[Dict] = None, ids: List[str] = None) -> int:
+        """
+        Add many documents to the knowledge base in batches
+
+        Embeddings are requested in batches of `embedding_batch_size` and vectors are
+        upserted in batches of `upsert_batch_size`, instead of one round-trip per document.
+
+        Args:
+            texts: Text contents to add
+            metadatas: Optional metadata for each text (same order as texts)
+            ids: Optional document IDs (auto-generated from text if not provided)
+
+        Returns:
+            Number of documents added
+        """
+        if not texts:
+            return 0
+
+        if metadatas is None:
+            metadatas = [{} for _ in texts]
+        if ids is None:
+            ids = [hashlib.md5(text.encode()).hexdigest() for text in texts]
+
+        # Generate all embeddings up front (one request per embedding batch)
+        embeddings = self._get_embeddings(texts)
+
+        vectors = []
+        for doc_id, text, metadata, embedding in zip(ids, texts, metadatas, embeddings):
+            metadata_with_text = dict(metadata or {})
+            metadata_with_text['text'] = text
+            vectors.append({
+                'id': doc_id,
+                'values': embedding,
+                'metadata': metadata_with_text
+            })
+
+        # Add to Pinecone index
+        try:
+            for start in range(0, len(vectors), self.upsert_batch_size):
+                self.index.upsert(vectors=vectors[start:start + self.upsert_batch_size])
+            print(f"Added {len(vectors)} documents to Pinecone index")
+        except Exception as e:
+            print(f"Error adding documents to Pinecone: {e}")
+            raise
+
+        return len(vectors)
@@ -13,7 +13,7 @@ from email import message_from_string
 from email.utils import parsedate_to_datetime
 from bs4 import BeautifulSoup
 from chatbot import ChatbotAgent
-from typing import List, Dict, Tuple
+from typing import List, Dict, Tuple, Iterator, Optional
 import glob
 
 # Optional imports for Word and PDF
@@ -29,10 +29,34 @@ try:
 except ImportError:
     PDF_AVAILABLE = False
 
+# File extension -> DataProcessor parser method used by iter_process
+# (.txt and unknown extensions are decided by file name in iter_process)
+EXT_HANDLERS = {
+    '.mbox': 'iter_mbox_file',
+    '.eml': 'process_email_file',
+    '.docx': 'process_word_document',
+    '.pdf': 'process_pdf_document',
+    '.xml': 'process_text_message_file',
+    '.csv': 'process_text_message_file',
+    '.json': 'process_text_message_file',
+}
+
 class DataProcessor:
-    def __init__(self):
-        """Initialize the data processor with chatbot agent"""
-        self.chatbot = ChatbotAgent()
+    def __init__(self, chatbot: Optional[ChatbotAgent] = None):
+        """
+        Initialize the data processor with chatbot agent
+        
+        Args:
+            chatbot: Existing ChatbotAgent to reuse (a new one is created on first use if omitted)
+        """
+        self._chatbot = chatbot
+    
+    @property
+    def chatbot(self) -> ChatbotAgent:
+        """ChatbotAgent used to store documents (created lazily, so parse-only use stays cheap)"""
+        if self._chatbot is None:
+            self._chatbot = ChatbotAgent()
+        return self._chatbot
         
     def process_email_file(self, file_path: str, audience: str = None) -> List[Dict]:
         """
@@ -382,8 +406,19 @@ class DataProcessor:
         Returns:
             List of processed email documents
         """
-        documents = []
+        return list(self.iter_mbox_file(file_path, audience=audience))
+    
+    def iter_mbox_file(self, file_path: str, audience: str = None) -> Iterator[Dict]:
+        """
+        Yield documents from an MBOX file one message at a time
         
+        Args:
+            file_path: Path to MBOX file
+            audience: Audience label ('sales_reps', 'customers', 'internal', or None)
+            
+        Yields:
+            Processed email documents
+        """
         try:
             mbox = mailbox.mbox(file_path)
             
@@ -431,12 +466,46 @@ class DataProcessor:
                         }
                         if audience:
                             metadata['audience'] = audience
-                        documents.append({'text': chunk, 'metadata': metadata})
+                        yield {'text': chunk, 'metadata': metadata}
         
         except Exception as e:
             print(f"Error parsing MBOX file {file_path}: {e}")
+    
+    def iter_process(self, file_path: str, audience: str = None) -> Iterator[Dict]:
+        """
+        Yield documents from any supported file, choosing the parser by file name
         
-        return documents
+        MBOX archives are streamed message by message so large archives never
+        sit in memory as a whole; other formats are yielded from their parser's list.
+        
+        Args:
+            file_path: Path to the file
+            audience: Audience label ('sales_reps', 'customers', 'internal', or None)
+            
+        Yields:
+            Processed documents
+        """
+        filename = os.path.basename(file_path)
+        ext = os.path.splitext(filename)[1].lower()
+        
+        method_name = EXT_HANDLERS.get(ext) or self._txt_fallback(filename)
+        yield from getattr(self, method_name)(file_path, audience=audience)
+    
+    def _txt_fallback(self, filename: str) -> str:
+        """
+        Pick the parser for a file with no EXT_HANDLERS entry (mostly .txt exports)
+        
+        Args:
+            filename: Base name of the file
+            
+        Returns:
+            Name of the DataProcessor method to parse it with
+        """
+        lower = filename.lower()
+        if lower.endswith('.txt') and not ('email' in lower or 'mail' in lower):
+            # Plain text that isn't named like an email is treated as SMS
+            return 'process_text_message_file'
+        return 'process_email_file'
     
     def _clean_text(self, text: str) -> str:
         """Clean and normalize text"""
@@ -518,42 +587,17 @@ class DataProcessor:
         for file_path in all_files:
             print(f"Processing: {file_path}")
             
-            # Determine file type and process accordingly
-            if file_path.endswith('.mbox'):
-                documents = self.process_mbox_file(file_path, audience=audience)
-            elif file_path.endswith('.eml'):
-                documents = self.process_email_file(file_path, audience=audience)
-            elif file_path.endswith('.docx'):
-                documents = self.process_word_document(file_path, audience=audience)
-            elif file_path.endswith('.pdf'):
-                documents = self.process_pdf_document(file_path, audience=audience)
-            elif file_path.endswith('.xml'):
-                documents = self.process_text_message_file(file_path, audience=audience)  # XML SMS
-            elif file_path.endswith('.csv'):
-                # Try SMS first, fall back to email if needed
-                if 'sms' in file_path.lower() or 'text' in file_path.lower() or 'message' in file_path.lower():
-                    documents = self.process_text_message_file(file_path, audience=audience)
-                else:
-                    documents = self.process_text_message_file(file_path, audience=audience)  # Try SMS format
-            elif 'email' in file_path.lower() or 'mail' in file_path.lower():
-                documents = self.process_email_file(file_path, audience=audience)
-            elif 'sms' in file_path.lower() or 'text' in file_path.lower() or 'message' in file_path.lower():
-                documents = self.process_text_message_file(file_path, audience=audience)
-            elif file_path.endswith('.json'):
-                documents = self.process_text_message_file(file_path, audience=audience)
-            else:
-                # Default: try email parsing first
-                documents = self.process_email_file(file_path, audience=audience)
-            
-            # Add documents to knowledge base
-            for doc in documents:
-                doc_id = f"{os.path.basename(file_path)}_{doc['metadata'].get('chunk_index', 0)}"
-                self.chatbot.add_document(
-                    text=doc['text'],
-                    metadata=doc['metadata'],
-                    doc_id=doc_id
+            # Same extension table and .txt heuristic as uploads processed from the web app
+            documents = list(self.iter_process(file_path, audience=audience))
+            
+            # Add documents to knowledge base in one bulk call per file
+            if documents:
+                base_name = os.path.basename(file_path)
+                total_documents += self.chatbot.add_documents_bulk(
+                    texts=[doc['text'] for doc in documents],
+                    metadatas=[doc['metadata'] for doc in documents],
+                    ids=[f"{base_name}_{doc['metadata'].get('chunk_index', 0)}" for doc in documents]
                 )
-                total_documents += 1
         
         print(f"\nProcessing complete! Added {total_documents} documents to knowledge base.")
         return total_documents
@@ -580,7 +624,8 @@ class DataProcessor:
         cleaned_text = self._clean_text(content)
         chunks = self._split_into_chunks(cleaned_text, max_length=2000)
         
-        total_documents = 0
+        metadatas = []
+        doc_ids = []
         for i, chunk in enumerate(chunks):
             metadata = {
                 'source': 'google_docs',
@@ -593,15 +638,10 @@ class DataProcessor:
             if audience:
                 metadata['audience'] = audience
             
-            doc_id = f"googledoc_{document_id}_{i}"
-            self.chatbot.add_document(
-                text=chunk,
-                metadata=metadata,
-                doc_id=doc_id
-            )
-            total_documents += 1
+            metadatas.append(metadata)
+            doc_ids.append(f"googledoc_{document_id}_{i}")
         
-        return total_documents
+        return self.chatbot.add_documents_bulk(texts=chunks, metadatas=metadatas, ids=doc_ids)
     
     def process_gitlab_documents(self, documents: List[Dict], audience: str = None) -> int:
         """
@@ -614,7 +654,9 @@ class DataProcessor:
         Returns:
             Number of documents added
         """
-        total_documents = 0
+        texts = []
+        metadatas = []
+        doc_ids = []
         
         for doc in documents:
             content = doc.get('content', '')
@@ -641,16 +683,13 @@ class DataProcessor:
                     file_path_safe = metadata['file_path'].replace('/', '_').replace('\\', '_')
                     doc_id = f"gitlab_{source_type}_{file_path_safe}_{i}"
                 else:
-                    doc_id = f"gitlab_{source_type}_{total_documents}_{i}"
+                    doc_id = f"gitlab_{source_type}_{len(texts)}_{i}"
                 
-                self.chatbot.add_document(
-                    text=chunk,
-                    metadata=chunk_metadata,
-                    doc_id=doc_id
-                )
-                total_documents += 1
+                texts.append(chunk)
+                metadatas.append(chunk_metadata)
+                doc_ids.append(doc_id)
         
-        return total_documents
+        return self.chatbot.add_documents_bulk(texts=texts, metadatas=metadatas, ids=doc_ids)
     
     def process_word_document(self, file_path: str, audience: str = None) -> List[Dict]:
         """
@@ -768,6 +807,28 @@ class DataProcessor:
         
         return documents
 
+# Per-process DataProcessor for parse_file() in worker processes
+_worker_processor = None
+
+def parse_file(file_path: str, audience: str = None) -> List[Dict]:
+    """
+    Parse one file into documents without storing them
+    
+    Module-level so it can run in a ProcessPoolExecutor worker; each worker
+    keeps one DataProcessor and never creates a ChatbotAgent.
+    
+    Args:
+        file_path: Path to the file
+        audience: Audience label ('sales_reps', 'customers', 'internal', or None)
+        
+    Returns:
+        List of processed documents
+    """
+    global _worker_processor
+    if _worker_processor is None:
+        _worker_processor = DataProcessor()
+    return list(_worker_processor.iter_process(file_path, audience=audience))
+
 def main():
     """Main function to run data processing"""
     import argparse
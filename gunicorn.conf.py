@@ -0,0 +1,46 @@
+"""
+Gunicorn configuration
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Processing status, SMS conversations and background jobs live in process memory,
+# so default to a single worker and let threads overlap the OpenAI/Pinecone calls.
+# Set WEB_CONCURRENCY (up to 2 * CPUs + 1) once that state is shared.
+workers = int(os.getenv('WEB_CONCURRENCY', '1'))
+workers = min(workers, multiprocessing.cpu_count() * 2 + 1)
+worker_class = 'gthread'
+threads = int(os.getenv('GUNICORN_THREADS', '8'))
+# Each open /api/status/stream holds a thread for a whole processing run; web_app caps them at
+# MAX_STATUS_STREAMS (default 2) per worker so the rest stay free for queries and the Twilio webhook.
+# Keep it well below threads when raising either.
+
+# Import the app once in the master and fork workers from it
+preload_app = True
+
+# Answer generation can take a while; don't kill workers mid-request
+timeout = 120
+graceful_timeout = 30
+keepalive = 5
+
+# Static files (send_from_directory -> wsgi.file_wrapper) go out via sendfile(2), not a read/write loop
+sendfile = True
+
+accesslog = '-'
+errorlog = '-'
+
+
+def pre_fork(server, worker):
+    """Drop the master's PostgreSQL connections so workers don't share its sockets"""
+    import web_app
+    web_app.close_db_pool()
+
+
+def post_fork(server, worker):
+    """Build the chatbot clients in each worker (after fork, so no sockets are shared) before it serves"""
+    import web_app
+    web_app.warm_up()
@@ -1,6 +1,10 @@
 // Global state
 let uploadedFiles = [];
 let statusCheckInterval = null;
+let statusEventSource = null;
+let statusSeenProcessing = false; // Whether the current status check has seen a run in progress
+let statusCheckStartedAt = 0;
+const STATUS_IDLE_TIMEOUT_MS = 30000; // Give up on a run that never shows up as processing
 let conversationSessionId = 'session_' + Date.now(); // Unique session ID
 let conversationHistory = []; // Store conversation history locally
 let currentFileFilter = 'all'; // Current file type filter
@@ -444,34 +448,74 @@ function processAllFiles() {
 }
 
 function startStatusCheck() {
-    if (statusCheckInterval) {
-        clearInterval(statusCheckInterval);
+    stopStatusCheck();
+    statusSeenProcessing = false;
+    statusCheckStartedAt = Date.now();
+    
+    // Prefer server-pushed updates; fall back to polling if EventSource isn't available
+    if (window.EventSource) {
+        statusEventSource = new EventSource('/api/status/stream');
+        statusEventSource.onmessage = event => handleStatus(JSON.parse(event.data));
+        // The server ends the stream after the run finishes or when none shows up
+        statusEventSource.addEventListener('done', () => finishStatusCheck(null));
+        statusEventSource.onerror = () => {
+            console.error('Status stream error, falling back to polling');
+            stopStatusCheck();
+            startStatusPolling();
+        };
+    } else {
+        startStatusPolling();
     }
-    
+}
+
+function startStatusPolling() {
     // Check status every 500ms for more responsive updates
     statusCheckInterval = setInterval(checkStatus, 500);
     checkStatus(); // Check immediately
 }
 
+function stopStatusCheck() {
+    if (statusEventSource) {
+        statusEventSource.close();
+        statusEventSource = null;
+    }
+    if (statusCheckInterval) {
+        clearInterval(statusCheckInterval);
+        statusCheckInterval = null;
+    }
+}
+
 function checkStatus() {
     fetch('/api/status')
         .then(response => response.json())
-        .then(status => {
-            updateProcessingStatus(status);
-            
-            if (!status.is_processing && status.files_processed > 0) {
-                clearInterval(statusCheckInterval);
-                statusCheckInterval = null;
-                loadStats();
-                loadFiles();
-                showToast(`Processing complete! Added ${status.documents_added} documents.`, 'success');
-            }
-        })
+        .then(handleStatus)
         .catch(error => {
             console.error('Status check error:', error);
         });
 }
 
+function handleStatus(status) {
+    updateProcessingStatus(status);
+    
+    if (status.is_processing) {
+        statusSeenProcessing = true;
+    } else if (statusSeenProcessing) {
+        // Finished - even if every file failed or there was nothing to process
+        finishStatusCheck(status);
+    } else if (Date.now() - statusCheckStartedAt >= STATUS_IDLE_TIMEOUT_MS) {
+        finishStatusCheck(null);
+    }
+}
+
+function finishStatusCheck(status) {
+    stopStatusCheck();
+    loadStats();
+    loadFiles();
+    if (status) {
+        showToast(`Processing complete! Added ${status.documents_added} documents.`, 'success');
+    }
+}
+
 function updateProcessingStatus(status) {
     const statusDiv = document.getElementById('processingStatus');
     const progressBar = document.getElementById('progressBar');
@@ -836,8 +880,8 @@ function verifyFile(filename) {
     // Extract the base filename (remove timestamp prefix if present)
     let searchFilename = filename;
     if (filename.includes('_') && filename.match(/^\d{8}_\d{6}_/)) {
-        // Remove timestamp prefix: YYYYMMDD_HHMMSS_
-        searchFilename = filename.replace(/^\d{8}_\d{6}_/, '');
+        // Remove timestamp prefix: YYYYMMDD_HHMMSS_ (plus NNN_ upload counter if present)
+        searchFilename = filename.replace(/^\d{8}_\d{6}_(?:\d{3}_)?/, '');
     }
     
     // Search for this file in the knowledge base
@@ -1109,8 +1153,7 @@ function analyzeFAQs() {
     btn.disabled = true;
     btn.innerHTML = '<span class="spinner-border spinner-border-sm"></span> Analyzing...';
     
-    fetch('/api/analyze/faqs?max_questions=20&sample_size=200')
-        .then(response => response.json())
+    fetchFAQs('/api/analyze/faqs?max_questions=20&sample_size=200')
         .then(data => {
             btn.disabled = false;
             btn.innerHTML = '<i class="bi bi-graph-up"></i> Analyze FAQs';
@@ -1130,6 +1173,18 @@ function analyzeFAQs() {
         });
 }
 
+function fetchFAQs(url) {
+    // The analysis runs in the background; keep polling while the server answers 202
+    return fetch(url).then(response => {
+        if (response.status === 202) {
+            return response.json().then(data => new Promise(resolve => {
+                setTimeout(() => resolve(fetchFAQs(data.poll_url || url)), 2000);
+            }));
+        }
+        return response.json();
+    });
+}
+
 function displayFAQs(faqs, count) {
     const container = document.getElementById('faqsResults');
     
@@ -0,0 +1,9 @@
+"""
+WSGI entry point for production servers
+Run with: gunicorn -c gunicorn.conf.py wsgi:app
+"""
+
+from web_app import app
+
+if __name__ == '__main__':
+    app.run()